@@ -4,5 +4,18 @@ try:
 except ImportError:
     __version__ = "unknown"
 
-from ._qt.tomoslice import napari_experimental_provide_dock_widget
+from napari_plugin_engine import napari_hook_implementation
+
+
+@napari_hook_implementation
+def napari_experimental_provide_dock_widget():
+    # the widget is imported on demand so that importing the package, e.g.
+    # from the command line interface, doesn't import napari and Qt
+    from ._qt.tomoslice import TomoSliceWidget
+    widget_options = {
+        "name": "napari-tomoslice",
+        "add_vertical_stretch": False,
+        "area": 'left',
+    }
+    return TomoSliceWidget, widget_options
 
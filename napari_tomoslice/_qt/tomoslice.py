@@ -1,5 +1,4 @@
 import napari.viewer
-from napari_plugin_engine import napari_hook_implementation
 from qtpy.QtWidgets import QWidget, QVBoxLayout, QFileDialog
 
 
@@ -91,19 +90,11 @@ class TomoSliceWidget(QWidget):
         enable_with_opacity(self.plane_thickness_controls)
 
     def _on_thickness_slider_changed(self):
-        self.tomoslice.plane_thickness = self.plane_thickness_controls.slider.value()
+        # the slider already shows the new value, don't echo it back
+        with self.tomoslice.plane_thickness_changed.blocked():
+            self.tomoslice.plane_thickness = self.plane_thickness_controls.slider.value()
 
     def _on_plane_thickness_changed(self):
         self.plane_thickness_controls.slider.setValue(
             self.tomoslice.plane_thickness
         )
-
-
-@napari_hook_implementation
-def napari_experimental_provide_dock_widget():
-    widget_options = {
-        "name": "napari-tomoslice",
-        "add_vertical_stretch": False,
-        "area": 'left',
-    }
-    return TomoSliceWidget, widget_options
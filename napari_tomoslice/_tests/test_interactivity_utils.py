@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from napari_tomoslice.interactivity_utils import drag_data_to_plane_position
+
+
+def _reference_plane_position(
+        start_position,
+        end_position,
+        view_direction,
+        plane_normal,
+        plane_position,
+        bounding_box
+):
+    """Drag a plane step by step, as napari's geometry utilities do.
+
+    The end position is projected onto a pseudo-canvas through the start
+    position, the drag vector on that canvas is projected onto the plane
+    normal and the shifted plane is clamped into the bounding box as in
+    `napari.utils.geometry.clamp_point_to_bounding_box`.
+    """
+    distance_to_canvas = np.dot(end_position - start_position, view_direction)
+    end_position_canvas = end_position - distance_to_canvas * view_direction
+    drag_vector_canvas = end_position_canvas - start_position
+    drag_distance = np.dot(drag_vector_canvas, plane_normal)
+    updated_position = plane_position + drag_distance * plane_normal
+    return np.clip(
+        updated_position, bounding_box[:, 0], bounding_box[:, 1] - 1
+    )
+
+
+def _random_unit_vector(rng):
+    vector = rng.normal(size=3)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_drag_data_to_plane_position(seed):
+    rng = np.random.default_rng(seed)
+    start_position, end_position = rng.uniform(0, 100, size=(2, 3))
+    view_direction = _random_unit_vector(rng)
+    plane_normal = _random_unit_vector(rng)
+    plane_position = rng.uniform(0, 100, size=3)
+    bounding_box = np.array([[0, 100], [0, 80], [0, 60]], dtype=float)
+    clamp_limits = np.stack([bounding_box[:, 0], bounding_box[:, 1] - 1])
+
+    expected = _reference_plane_position(
+        start_position,
+        end_position,
+        view_direction,
+        plane_normal,
+        plane_position,
+        bounding_box
+    )
+    result = drag_data_to_plane_position(
+        start_position,
+        end_position,
+        view_direction,
+        plane_normal,
+        plane_position,
+        clamp_limits
+    )
+    np.testing.assert_allclose(result, expected)
+
+
+def test_drag_data_to_plane_position_clamps():
+    bounding_box = np.array([[0, 10], [0, 10], [0, 10]], dtype=float)
+    clamp_limits = np.stack([bounding_box[:, 0], bounding_box[:, 1] - 1])
+    plane_normal = np.array([1, 0, 0], dtype=float)
+    out = np.empty(3)
+
+    # dragging far along the normal stops at the edge of the bounding box
+    result = drag_data_to_plane_position(
+        start_position=np.zeros(3),
+        end_position=np.array([50, 0, 0]),
+        view_direction=np.array([0, 0, 1], dtype=float),
+        plane_normal=plane_normal,
+        plane_position=np.array([5, 5, 5], dtype=float),
+        clamp_limits=clamp_limits,
+        out=out,
+    )
+    assert result is out
+    np.testing.assert_allclose(result, [9, 5, 5])
+
+    # dragging along the view direction doesn't move the plane
+    result = drag_data_to_plane_position(
+        start_position=np.zeros(3),
+        end_position=np.array([3, 0, 0]),
+        view_direction=plane_normal,
+        plane_normal=plane_normal,
+        plane_position=np.array([5, 5, 5], dtype=float),
+        clamp_limits=clamp_limits,
+    )
+    np.testing.assert_allclose(result, [5, 5, 5])
+
+    # integer positions are accepted without an output buffer
+    result = drag_data_to_plane_position(
+        start_position=np.array([0, 0, 0]),
+        end_position=np.array([3, 0, 0]),
+        view_direction=np.array([0, 0, 1], dtype=float),
+        plane_normal=plane_normal,
+        plane_position=np.array([5, 5, 5]),
+        clamp_limits=clamp_limits.astype(int),
+    )
+    assert result.dtype == np.float64
+    np.testing.assert_allclose(result, [8, 5, 5])
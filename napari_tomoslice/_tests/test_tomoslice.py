@@ -0,0 +1,75 @@
+import threading
+
+import numpy as np
+import pytest
+
+from napari_tomoslice.tomoslice import prefetch_tomogram, quantize_tomogram
+
+
+class SectionRecordingArray(np.ndarray):
+    """Array recording which sections are read through slicing."""
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            self.sections_read.extend(range(*key.indices(len(self))))
+        return np.asarray(self)[key]
+
+
+def _recording_tomogram(shape):
+    tomogram = np.zeros(shape, dtype=np.float32).view(SectionRecordingArray)
+    tomogram.sections_read = []
+    return tomogram
+
+
+def test_quantize_tomogram():
+    rng = np.random.default_rng(0)
+    tomogram = rng.normal(size=(16, 16, 16)).astype(np.float32)
+    quantized = quantize_tomogram(tomogram, percentiles=(0, 100))
+    assert quantized.dtype == np.uint8
+    assert quantized.shape == tomogram.shape
+
+    # values are rescaled linearly between percentiles of a subsample
+    low, high = np.percentile(tomogram[::4, ::4, ::4], (0, 100))
+    expected = np.clip((tomogram - low) / (high - low) * 255, 0, 255)
+    np.testing.assert_allclose(quantized, np.rint(expected), atol=1)
+
+
+def test_quantize_tomogram_clips_outliers():
+    # sections 0 and 4 are subsampled, so the percentiles span 0 to 4
+    tomogram = np.broadcast_to(
+        np.arange(8, dtype=np.float32)[:, None, None], (8, 8, 8)
+    ).copy()
+    tomogram[1, 1, 1] = 1000
+    tomogram[1, 1, 2] = -1000
+    quantized = quantize_tomogram(tomogram, percentiles=(0, 100))
+    assert quantized[0, 0, 0] == 0
+    assert quantized[2, 0, 0] == 128
+    assert quantized[4, 0, 0] == 255
+    assert quantized[7, 0, 0] == 255
+    assert quantized[1, 1, 1] == 255
+    assert quantized[1, 1, 2] == 0
+
+
+def test_quantize_constant_tomogram():
+    tomogram = np.full((4, 5, 6), 3.5, dtype=np.float32)
+    quantized = quantize_tomogram(tomogram)
+    assert quantized.dtype == np.uint8
+    assert quantized.shape == tomogram.shape
+    assert np.all(quantized == 0)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4 * 5 * 6 * 2, 10 ** 9])
+def test_prefetch_tomogram_reads_all_sections(chunk_size):
+    # chunks smaller than a section, of two sections and larger than the
+    # whole tomogram
+    tomogram = _recording_tomogram((7, 5, 6))
+    prefetch_tomogram(tomogram, threading.Event(), chunk_size=chunk_size)
+    assert sorted(tomogram.sections_read) == list(range(7))
+
+
+def test_prefetch_tomogram_stops_when_set():
+    tomogram = _recording_tomogram((7, 5, 6))
+    stop = threading.Event()
+    stop.set()
+    prefetch_tomogram(tomogram, stop, chunk_size=1)
+    assert tomogram.sections_read == []
@@ -1,18 +1,23 @@
 from pathlib import Path
 
-import napari
 import typer
 
 cli = typer.Typer()
 
 
 @cli.command()
-def napari_tomoslice(tomogram_file: Path = typer.Argument(
-    None,
-    exists=True,
-    file_okay=True,
-    readable=True,
-)):
+def napari_tomoslice(
+    tomogram_file: Path = typer.Argument(
+        None,
+        exists=True,
+        file_okay=True,
+        readable=True,
+    ),
+    full_precision: bool = typer.Option(
+        False,
+        help='display data at full precision rather than as 8-bit',
+    ),
+):
     """An interactive tomogram slice viewer in napari.
 
     Controls:
@@ -22,10 +27,15 @@ def napari_tomoslice(tomogram_file: Path = typer.Argument(
     o - align plane normal to view direction
     [] - decrease/increase plane thickness
     """
+    # imported here so that --help doesn't pay for importing napari and Qt
+    import napari
+
     viewer = napari.Viewer()
     _, tomoslice_widget = viewer.window.add_plugin_dock_widget(
         plugin_name='napari-tomoslice'
     )
     if tomogram_file is not None:
-        tomoslice_widget.tomoslice.open_tomogram(tomogram_file)
+        tomoslice_widget.tomoslice.open_tomogram(
+            tomogram_file, full_precision=full_precision
+        )
     napari.run()
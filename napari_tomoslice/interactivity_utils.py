@@ -1,7 +1,5 @@
 import numpy as np
 
-from napari.utils.geometry import project_point_onto_plane
-
 
 def point_in_bounding_box(point: np.ndarray, bounding_box: np.ndarray) -> bool:
     """Determine whether an nD point is inside an nD bounding box.
@@ -18,17 +16,21 @@ def point_in_bounding_box(point: np.ndarray, bounding_box: np.ndarray) -> bool:
     return False
 
 
-def drag_data_to_projected_distance(
-        start_position, end_position, view_direction, vector
+def drag_data_to_plane_position(
+        start_position,
+        end_position,
+        view_direction,
+        plane_normal,
+        plane_position,
+        clamp_limits,
+        out=None,
 ):
-    """Calculate the projected distance between two mouse events.
-    Project the drag vector between two mouse events onto a 3D vector
-    specified in data coordinates.
-    The general strategy is to
-    1) find mouse drag start and end positions, project them onto a
-       pseudo-canvas (a plane aligned with the canvas) in data coordinates.
-    2) project the mouse drag vector onto the (normalised) vector in data
-       coordinates
+    """Calculate the position of a plane shifted by a mouse drag.
+    The drag vector between two mouse events is projected onto a
+    pseudo-canvas (a plane aligned with the canvas) and then onto the plane
+    normal, the plane is shifted along its normal by that distance and
+    clamped between limits. This is done in a single call, avoiding
+    intermediate arrays on the mouse drag path.
     Parameters
     ----------
     start_position : np.ndarray
@@ -36,43 +38,32 @@ def drag_data_to_projected_distance(
     end_position : np.ndarray
         End point of the drag vector in data coordinates
     view_direction : np.ndarray
-        Vector defining the plane normal of the plane onto which the drag
-        vector is projected.
-    vector : np.ndarray
-        (3,) unit vector or (n, 3) array thereof on which to project the drag
-        vector from start_event to end_event. This argument is defined in data
-        coordinates.
+        (3,) unit vector defining the normal of the pseudo-canvas onto which
+        the drag vector is projected.
+    plane_normal : np.ndarray
+        (3,) unit vector normal to the plane, in data coordinates.
+    plane_position : np.ndarray
+        (3,) position of the plane before the drag, in data coordinates.
+    clamp_limits : np.ndarray
+        (2, 3) array containing the min and max allowed plane position.
+    out : np.ndarray, optional
+        (3,) array in which to store the result.
     Returns
     -------
-    projected_distance : (1, ) or (n, ) np.ndarray of float
+    plane_position : (3, ) np.ndarray
     """
-    # enforce at least 2d input
-    vector = np.atleast_2d(vector)
-
-    # Store the start and end positions in world coordinates
-    start_position = np.array(start_position)
-    end_position = np.array(end_position)
+    if out is None:
+        out = np.empty(3)
+    drag_vector = np.subtract(end_position, start_position, out=out)
 
-    # Project the start and end positions onto a pseudo-canvas, a plane
-    # parallel to the rendered canvas in data coordinates.
-    start_position_canvas = start_position
-    end_position_canvas = project_point_onto_plane(
-        end_position, start_position_canvas, view_direction
+    # Project the drag vector onto the pseudo-canvas then onto the normal
+    drag_distance = np.dot(drag_vector, plane_normal) - (
+        np.dot(drag_vector, view_direction)
+        * np.dot(view_direction, plane_normal)
     )
-    # Calculate the drag vector on the pseudo-canvas.
-    drag_vector_canvas = np.squeeze(
-        end_position_canvas - start_position_canvas
-    )
-
-    # Project the drag vector onto the specified vector(s), return the distance
-    return np.einsum('j, ij -> i', drag_vector_canvas, vector).squeeze()
-
-
-def point_in_layer_bounding_box(point, layer):
-    bbox = layer._display_bounding_box(layer._dims_displayed).T
-    if np.any(point < bbox[0]) or np.any(point > bbox[1]):
-        return False
-    else:
-        return True
-
 
+    # Shift the plane along its normal and clamp it between the limits
+    updated_position = np.multiply(plane_normal, drag_distance, out=drag_vector)
+    updated_position += plane_position
+    np.maximum(updated_position, clamp_limits[0], out=updated_position)
+    return np.minimum(updated_position, clamp_limits[1], out=updated_position)
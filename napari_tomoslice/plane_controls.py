@@ -1,19 +1,37 @@
+from time import perf_counter
 from typing import Optional
 
 import napari.layers
 import napari.viewer
 import numpy as np
-from napari.utils.geometry import clamp_point_to_bounding_box
 from napari.utils.events import Event
 
-from napari_tomoslice.interactivity_utils import point_in_bounding_box, \
-    drag_data_to_projected_distance, point_in_layer_bounding_box
+from napari_tomoslice.interactivity_utils import drag_data_to_plane_position
 
+# minimum time between plane updates during a drag (~60 Hz)
+MIN_DRAG_UPDATE_INTERVAL = 0.016
 
-def shift_plane_along_normal(viewer, event, layer: Optional[napari.layers.Image] = None):
+AXIS_TO_NORMAL = {
+    'z': np.array([1, 0, 0]),
+    'y': np.array([0, 1, 0]),
+    'x': np.array([0, 0, 1]),
+}
+
+
+def shift_plane_along_normal(
+        viewer,
+        event,
+        layer: Optional[napari.layers.Image] = None,
+        data_extent: Optional[np.ndarray] = None,
+):
     """Shift a rendered plane along its normal vector.
     This function will shift a plane along its normal vector when the plane is
-    clicked and dragged."""
+    clicked and dragged. data_extent can be passed to avoid recalculating
+    the layer extent on each click."""
+    # Early exit if plane isn't being rendered
+    if not (layer.experimental_slicing_plane.enabled and layer.visible):
+        return
+
     # Calculate intersection of click with plane through data in data coordinates
     intersection = layer.experimental_slicing_plane.intersect_with_line(
         line_position=event.position,
@@ -22,45 +40,85 @@ def shift_plane_along_normal(viewer, event, layer: Optional[napari.layers.Image]
 
     # Check if click was on plane by checking if intersection occurs within
     # data bounding box. If not, exit early.
-    if not point_in_bounding_box(intersection, layer.extent.data):
+    if data_extent is None:
+        data_extent = layer.extent.data
+    bbox_min, bbox_max = data_extent
+    if not ((intersection > bbox_min).all() and (intersection < bbox_max).all()):
         return
 
     # Update plane position to match intersection
     layer.experimental_slicing_plane.position = intersection
 
-    # Store original plane position and disable interactivity during plane drag
-    original_plane_position = np.copy(layer.experimental_slicing_plane.position)
+    # Store plane position and disable interactivity during plane drag
+    plane_position = np.array(
+        layer.experimental_slicing_plane.position, dtype=np.float64
+    )
     layer.interactive = False
 
-    # Store mouse position at start of drag
-    start_position = np.copy(event.position)
-    yield
+    # Store mouse position, updated as the drag progresses
+    previous_position = np.array(event.position, dtype=np.float64)
 
-    while event.type == 'mouse_move':
-        current_position = event.position
-        current_view_direction = event.view_direction
-        current_plane_normal = layer.experimental_slicing_plane.normal
-
-        # Project mouse drag onto plane normal
-        drag_distance = drag_data_to_projected_distance(
-            start_position=start_position,
-            end_position=current_position,
-            view_direction=current_view_direction,
-            vector=current_plane_normal,
-        )
+    # Plane normal and display bounding box are constant during the drag,
+    # the plane is clamped inside the bounding box as in
+    # napari.utils.geometry.clamp_point_to_bounding_box
+    plane_normal = np.asarray(
+        layer.experimental_slicing_plane.normal, dtype=np.float64
+    )
+    display_bounding_box = layer._display_bounding_box(event.dims_displayed)
+    clamp_limits = np.stack(
+        [display_bounding_box[:, 0], display_bounding_box[:, 1] - 1]
+    ).astype(np.float64)
 
-        # Calculate updated plane position
-        updated_position = original_plane_position + (
-                drag_distance * np.array(layer.experimental_slicing_plane.normal)
-        )
+    # Preallocate buffer for the updated plane position
+    updated_position = np.empty(3)
+    yield
 
-        clamped_plane_position = clamp_point_to_bounding_box(
-            updated_position, layer._display_bounding_box(event.dims_displayed)
+    def update_plane_position():
+        # A drag can't move the plane when viewed along its normal, the drag
+        # vector on the pseudo-canvas is always perpendicular to the normal
+        if abs(np.dot(event.view_direction, plane_normal)) > 1 - 1e-3:
+            np.copyto(previous_position, event.position)
+            return
+
+        # Project the mouse drag since the last update onto the plane normal
+        # and shift the plane along it
+        drag_data_to_plane_position(
+            start_position=previous_position,
+            end_position=event.position,
+            view_direction=event.view_direction,
+            plane_normal=plane_normal,
+            plane_position=plane_position,
+            clamp_limits=clamp_limits,
+            out=updated_position,
         )
-
-        layer.experimental_slicing_plane.position = clamped_plane_position
+        np.copyto(previous_position, event.position)
+
+        # Skip setting the plane position if it hasn't moved, e.g. dragging
+        # past the edge of the bounding box
+        if np.allclose(updated_position, plane_position, rtol=0, atol=1e-6):
+            return
+        layer.experimental_slicing_plane.position = updated_position
+        np.copyto(plane_position, updated_position)
+
+    # Throttle updates, mouse move events can arrive much faster than the
+    # plane can be redrawn
+    last_update = 0.0
+    update_pending = False
+    while event.type == 'mouse_move':
+        now = perf_counter()
+        if now - last_update < MIN_DRAG_UPDATE_INTERVAL:
+            update_pending = True
+            yield
+            continue
+        update_plane_position()
+        last_update = now
+        update_pending = False
         yield
 
+    # Flush any skipped update so the plane lands where the mouse was released
+    if update_pending:
+        update_plane_position()
+
     # Re-enable volume_layer interactivity after the drag
     layer.interactive = True
 
@@ -70,23 +128,23 @@ def set_plane_normal_axis(
         layer: napari.layers.Image,
         axis='z'
 ):
-    axis_to_normal = {
-        'z': (1, 0, 0),
-        'y': (0, 1, 0),
-        'x': (0, 0, 1),
-    }
+    # Early exit if plane isn't being rendered
+    if not (layer.experimental_slicing_plane.enabled and layer.visible):
+        return
 
     new_plane_position = \
         layer.experimental_slicing_plane.intersect_with_line(
             line_position=viewer.cursor.position,
             line_direction=viewer.camera.view_direction,
         )
-    if not point_in_layer_bounding_box(new_plane_position, layer):
+    bbox_min, bbox_max = layer._display_bounding_box(layer._dims_displayed).T
+    if not ((new_plane_position >= bbox_min).all() and
+            (new_plane_position <= bbox_max).all()):
         # intersection can fall outside volume_layer bounding box
         new_plane_position = np.array(layer.data.shape) // 2
 
     layer.experimental_slicing_plane.position = new_plane_position
-    layer.experimental_slicing_plane.normal = axis_to_normal[axis]
+    layer.experimental_slicing_plane.normal = AXIS_TO_NORMAL[axis]
 
 
 def orient_plane_perpendicular_to_camera(
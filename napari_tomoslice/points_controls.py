@@ -1,9 +1,17 @@
+from typing import Optional
+
 import napari.layers
+import numpy as np
 
 from .interactivity_utils import point_in_bounding_box
 
 
-def add_point(viewer, event, volume_layer: napari.layers.Image = None):
+def add_point(
+        viewer,
+        event,
+        volume_layer: napari.layers.Image = None,
+        data_extent: Optional[np.ndarray] = None,
+):
     # Early exit if not alt-clicked
     if 'Alt' not in event.modifiers:
         return
@@ -28,7 +36,9 @@ def add_point(viewer, event, volume_layer: napari.layers.Image = None):
 
     # Check if click was on plane by checking if intersection occurs within
     # data bounding box. If not, exit early.
-    if not point_in_bounding_box(intersection, volume_layer.extent.data):
+    if data_extent is None:
+        data_extent = volume_layer.extent.data
+    if not point_in_bounding_box(intersection, data_extent):
         return
 
     # add point
@@ -1,8 +1,8 @@
+import threading
 from enum import auto
 from functools import partial
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
-import mrcfile
 import napari
 import napari.layers
 import numpy as np
@@ -14,6 +14,12 @@ from .plane_controls import shift_plane_along_normal, set_plane_normal_axis, \
 from .points_controls import add_point
 from napari.utils.geometry import clamp_point_to_bounding_box
 
+if TYPE_CHECKING:
+    import mrcfile
+
+# size of the blocks read ahead from memory-mapped tomograms, in bytes
+PREFETCH_CHUNK_SIZE = 16 * 1024 ** 2
+
 
 class RenderingMode(StringEnum):
     VOLUME = auto()
@@ -29,6 +35,10 @@ class TomoSlice:
         self.viewer.dims.ndisplay = 3
         self.volume_layer: Optional[napari.layers.Image] = None
         self.bounding_box_layer: Optional[napari.layers.Points] = None
+        self._data_extent: Optional[np.ndarray] = None
+        self._mrc: Optional['mrcfile.mrcfile.MrcFile'] = None
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._stop_prefetch = threading.Event()
         self._rendering_mode: RenderingMode = RenderingMode.VOLUME
 
     @property
@@ -37,8 +47,14 @@ class TomoSlice:
 
     @rendering_mode.setter
     def rendering_mode(self, value):
-        self._rendering_mode = RenderingMode(value)
-        self.volume_layer.experimental_slicing_plane.enabled = self._render_as_plane
+        rendering_mode = RenderingMode(value)
+        if rendering_mode is self._rendering_mode:
+            return
+        self._rendering_mode = rendering_mode
+        # block the emit forwarded from the plane's enabled event so a change
+        # is only signalled once
+        with self.rendering_mode_changed.blocked():
+            self.volume_layer.experimental_slicing_plane.enabled = self._render_as_plane
         self.rendering_mode_changed.emit(self.rendering_mode)
 
     @property
@@ -54,21 +70,43 @@ class TomoSlice:
 
     @plane_thickness.setter
     def plane_thickness(self, value):
+        # plane_thickness_changed is emitted from the plane's thickness event,
+        # which only fires when the value changes
+        if abs(self.plane_thickness - value) < 1e-9:
+            return
         self.volume_layer.experimental_slicing_plane.thickness = value
-        self.plane_thickness_changed.emit()
 
     def increase_plane_thickness(self, event=None):
         self.volume_layer.experimental_slicing_plane.thickness += 1
-        self.plane_thickness_changed.emit()
 
     def decrease_plane_thickness(self, event=None):
         self.volume_layer.experimental_slicing_plane.thickness -= 1
-        self.plane_thickness_changed.emit()
 
-    def open_tomogram(self, tomogram_file: str):
-        with mrcfile.open(tomogram_file) as mrc:
-            tomogram = mrc.data
-        self.add_volume_layer(tomogram)
+    def open_tomogram(self, tomogram_file: str, full_precision: bool = False):
+        import mrcfile
+
+        # a tomogram may already be open, release its memory-map first
+        self._close_mrc()
+        try:
+            # memory-map the file so data is paged in on demand, the handle
+            # is kept open for as long as the volume layer uses the data
+            self._mrc = mrcfile.mmap(str(tomogram_file), mode='r')
+            tomogram = self._mrc.data
+        except (OSError, ValueError):
+            # memory-mapping isn't available everywhere, read eagerly instead
+            with mrcfile.open(tomogram_file) as mrc:
+                tomogram = mrc.data
+        if full_precision:
+            contrast_limits = None
+            if self._mrc is not None:
+                self._start_prefetch(tomogram)
+        else:
+            # the renderer doesn't need 32-bit precision, uint8 textures are a
+            # quarter of the size to upload and store on the GPU
+            tomogram = quantize_tomogram(tomogram)
+            contrast_limits = (0, 255)
+            self._close_mrc()
+        self.add_volume_layer(tomogram, contrast_limits=contrast_limits)
         self.add_bounding_box()
         self.connect_callbacks()
         self.viewer.reset_view()
@@ -80,8 +118,34 @@ class TomoSlice:
         self.disconnect_callbacks()
         self.viewer.layers.remove(self.volume_layer)
         self.viewer.layers.remove(self.bounding_box_layer)
-
-    def add_volume_layer(self, tomogram: np.ndarray):
+        self._close_mrc()
+
+    def _start_prefetch(self, tomogram: np.ndarray):
+        # page in the memory-mapped data in the background so the first
+        # render doesn't stall on reads from slow filesystems
+        self._stop_prefetch.clear()
+        self._prefetch_thread = threading.Thread(
+            target=prefetch_tomogram,
+            args=(tomogram, self._stop_prefetch),
+            daemon=True,
+        )
+        self._prefetch_thread.start()
+
+    def _close_mrc(self):
+        if self._prefetch_thread is not None:
+            # the memory-map can't be closed while it is being read
+            self._stop_prefetch.set()
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+        if self._mrc is not None:
+            self._mrc.close()
+            self._mrc = None
+
+    def add_volume_layer(
+            self,
+            tomogram: np.ndarray,
+            contrast_limits: Optional[Tuple[float, float]] = None
+    ):
         render_as_plane = True if self.rendering_mode == RenderingMode.PLANE else False
         plane_parameters = {
             'enabled': render_as_plane,
@@ -91,11 +155,16 @@ class TomoSlice:
         }
         self.volume_layer = self.viewer.add_image(
             data=tomogram,
+            contrast_limits=contrast_limits,
             name='tomogram',
             colormap='gray_r',
             rendering='mip',
             experimental_slicing_plane=plane_parameters,
         )
+        # the plane is rendered by raycasting on the GPU, nearest neighbour
+        # sampling avoids the cost of trilinear filtering in the shader
+        self.volume_layer.interpolation = 'nearest'
+        self._data_extent = np.asarray(self.volume_layer.extent.data)
 
     def add_bounding_box(self):
         bounding_box_max = self.volume_layer.data.shape
@@ -167,31 +236,43 @@ class TomoSlice:
 
         return inner
 
+    def _on_drag(self, viewer, event):
+        layer = self.volume_layer
+        if layer is None:
+            return
+        yield from shift_plane_along_normal(
+            viewer, event, layer=layer, data_extent=self._data_extent
+        )
+
+    def _on_axis_key(self, viewer, axis='z'):
+        set_plane_normal_axis(viewer, layer=self.volume_layer, axis=axis)
+
+    def _emit_rendering_mode(self, event=None):
+        # the plane can also be toggled outside of the rendering_mode setter,
+        # e.g. from the layer controls, so derive the mode from the plane
+        if self.volume_layer.experimental_slicing_plane.enabled:
+            self._rendering_mode = RenderingMode.PLANE
+        else:
+            self._rendering_mode = RenderingMode.VOLUME
+        self.rendering_mode_changed.emit(self.rendering_mode)
+
+    def _emit_plane_thickness(self, event=None):
+        self.plane_thickness_changed.emit(self.plane_thickness)
+
     def connect_callbacks(self):
         # plane position (click and drag)
-        self._shift_plane_callback = partial(
-            self.if_plane_enabled(shift_plane_along_normal),
-            layer=self.volume_layer
-        )
-        self.viewer.mouse_drag_callbacks.append(
-            self._shift_plane_callback
-        )
+        self.viewer.mouse_drag_callbacks.append(self._on_drag)
 
         # plane orientation (ortho)
         for key in 'xyz':
-            callback = partial(
-                self.if_plane_enabled(set_plane_normal_axis),
-                layer=self.volume_layer,
-                axis=key
-            )
-            self.viewer.bind_key(key, callback)
+            self.viewer.bind_key(key, partial(self._on_axis_key, axis=key))
 
-        #
+        # forward plane changes to signals
         self.volume_layer.experimental_slicing_plane.events.enabled.connect(
-            partial(self.rendering_mode_changed.emit, self.rendering_mode)
+            self._emit_rendering_mode
         )
         self.volume_layer.experimental_slicing_plane.events.thickness.connect(
-            partial(self.plane_thickness_changed.emit, self.plane_thickness)
+            self._emit_plane_thickness
         )
 
         # # plane orientation(camera)
@@ -234,11 +315,11 @@ class TomoSlice:
             viewer.camera.center = \
                 self.volume_layer.experimental_slicing_plane.position
             viewer.camera.zoom = 3 * old_camera_zoom
-            self.viewer.mouse_drag_callbacks.remove(self._shift_plane_callback)
+            self.viewer.mouse_drag_callbacks.remove(self._on_drag)
             self.activate_plane_follows_camera()
             yield
             self.deactivate_plane_follows_camera()
-            self.viewer.mouse_drag_callbacks.append(self._shift_plane_callback)
+            self.viewer.mouse_drag_callbacks.append(self._on_drag)
             viewer.camera.center = old_camera_center
             viewer.camera.zoom = old_camera_zoom
 
@@ -247,15 +328,56 @@ class TomoSlice:
         # add point in points layer on alt-click
         self._add_point_callback = partial(
             self.if_plane_enabled(add_point),
-            volume_layer=self.volume_layer
+            volume_layer=self.volume_layer,
+            data_extent=self._data_extent
         )
         self.viewer.mouse_drag_callbacks.append(
             self._add_point_callback
         )
 
     def disconnect_callbacks(self):
-        self.viewer.mouse_drag_callbacks.remove(self._shift_plane_callback)
+        self.volume_layer.experimental_slicing_plane.events.enabled.disconnect(
+            self._emit_rendering_mode
+        )
+        self.volume_layer.experimental_slicing_plane.events.thickness.disconnect(
+            self._emit_plane_thickness
+        )
+        self.viewer.mouse_drag_callbacks.remove(self._on_drag)
         self.viewer.mouse_drag_callbacks.remove(self._add_point_callback)
         for key in 'xyzo[]':
             self.viewer.keymap.pop(key.upper())
 
+
+def quantize_tomogram(
+        tomogram: np.ndarray, percentiles: Tuple[float, float] = (0.5, 99.5)
+) -> np.ndarray:
+    """Rescale a tomogram to uint8 between two percentiles of its values.
+
+    Percentiles are estimated on a subsample of the tomogram and sections are
+    converted one at a time to limit temporary memory use.
+    """
+    low, high = np.percentile(tomogram[::4, ::4, ::4], percentiles)
+    scale = 255 / (high - low) if high > low else 0
+    quantized = np.empty(tomogram.shape, dtype=np.uint8)
+    for idx, section in enumerate(tomogram):
+        section = (section.astype(np.float32) - low) * scale
+        np.clip(section, 0, 255, out=section)
+        quantized[idx] = np.rint(section, out=section)
+    return quantized
+
+
+def prefetch_tomogram(
+        tomogram: np.ndarray,
+        stop: threading.Event,
+        chunk_size: int = PREFETCH_CHUNK_SIZE
+):
+    """Read through a memory-mapped tomogram to page it into memory.
+
+    Sections are read in blocks of roughly chunk_size bytes so other readers
+    can interleave, reading stops early when stop is set.
+    """
+    sections_per_chunk = max(1, chunk_size // max(1, tomogram[0].nbytes))
+    for start in range(0, len(tomogram), sections_per_chunk):
+        if stop.is_set():
+            return
+        np.max(tomogram[start:start + sections_per_chunk])